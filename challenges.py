@@ -1,16 +1,26 @@
-"""Challenge definitions loaded from YAML."""
+"""Challenge definitions loaded from YAML.
+
+Single source of truth for the challenge catalog: challenges.yaml is
+parsed once at import and every index below is derived from it.
+"""
+
+import re
 
 import yaml
 from pathlib import Path
 
-from models import Challenge, Hint
+from models import Challenge, ChallengeResponse, Hint
+
+# Prefer the libyaml-backed loader when available; it parses the same safe
+# subset of YAML several times faster than the pure-Python SafeLoader.
+_YamlLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
 
 
 def _load_challenges() -> list[Challenge]:
     """Load challenges from YAML file."""
     yaml_path = Path(__file__).parent / "challenges.yaml"
-    with open(yaml_path) as f:
-        data = yaml.safe_load(f)
+    with open(yaml_path, "rb") as f:
+        data = yaml.load(f, Loader=_YamlLoader)
 
     challenges = []
     for c in data["challenges"]:
@@ -35,6 +45,59 @@ def _load_challenges() -> list[Challenge]:
 
 CHALLENGES: list[Challenge] = _load_challenges()
 
+# Challenges are immutable after import, so index them once for O(1) lookups.
+CHALLENGES_BY_ID: dict[str, Challenge] = {c.id: c for c in CHALLENGES}
+
+CHALLENGES_BY_CATEGORY: dict[str, list[Challenge]] = {}
+for _challenge in CHALLENGES:
+    CHALLENGES_BY_CATEGORY.setdefault(_challenge.category, []).append(_challenge)
+
+# Public (answer-free) views are also static, so build them once instead of
+# constructing ChallengeResponse models on every request.
+CHALLENGE_RESPONSES: list[ChallengeResponse] = [
+    ChallengeResponse.model_construct(
+        id=c.id,
+        title=c.title,
+        description=c.description,
+        category=c.category,
+        points=c.points,
+        hint_count=len(c.hints),
+    )
+    for c in CHALLENGES
+]
+
+CHALLENGE_RESPONSES_BY_ID: dict[str, ChallengeResponse] = {
+    r.id: r for r in CHALLENGE_RESPONSES
+}
+
+CHALLENGE_RESPONSES_BY_CATEGORY: dict[str, list[ChallengeResponse]] = {}
+for _response in CHALLENGE_RESPONSES:
+    CHALLENGE_RESPONSES_BY_CATEGORY.setdefault(_response.category, []).append(_response)
+
+# Hints indexed by challenge id and level for O(1) lookup in /hints routes.
+HINTS_BY_CHALLENGE: dict[str, dict[int, Hint]] = {
+    c.id: {h.order: h for h in c.hints} for c in CHALLENGES
+}
+
+# Casefolded expected answers for exact-match validation, computed once so
+# /submit only casefolds the submitted side.
+CASEFOLDED_ANSWERS: dict[str, str] = {
+    c.id: c.expected_answer.casefold()
+    for c in CHALLENGES
+    if c.validation_type == "exact"
+}
+
+# Compile regex answers once at load time so /submit never pays for it.
+# An invalid pattern is left out of the map, and validate_answer treats the
+# missing entry as "no match" (the behavior re.fullmatch used to give us).
+COMPILED_PATTERNS: dict[str, re.Pattern] = {}
+for _challenge in CHALLENGES:
+    if _challenge.validation_type == "regex":
+        try:
+            COMPILED_PATTERNS[_challenge.id] = re.compile(_challenge.expected_answer, re.IGNORECASE)
+        except re.error:
+            pass
+
 
 def get_all_challenges() -> list[Challenge]:
     """Return all challenges."""
@@ -43,12 +106,41 @@ def get_all_challenges() -> list[Challenge]:
 
 def get_challenge_by_id(challenge_id: str) -> Challenge | None:
     """Return a challenge by ID."""
-    for challenge in CHALLENGES:
-        if challenge.id == challenge_id:
-            return challenge
-    return None
+    return CHALLENGES_BY_ID.get(challenge_id)
+
+
+def get_challenge_map() -> dict[str, Challenge]:
+    """Return the id->Challenge index for callers doing repeated lookups."""
+    return CHALLENGES_BY_ID
+
+
+def get_hint_by_level(challenge_id: str, level: int) -> Hint | None:
+    """Return a challenge's hint at the given level, if it exists."""
+    return HINTS_BY_CHALLENGE.get(challenge_id, {}).get(level)
+
+
+def get_compiled_pattern(challenge_id: str) -> re.Pattern | None:
+    """Return the precompiled regex for a challenge, if it has one."""
+    return COMPILED_PATTERNS.get(challenge_id)
+
+
+def get_casefolded_answer(challenge_id: str) -> str | None:
+    """Return the casefolded expected answer for an exact-match challenge."""
+    return CASEFOLDED_ANSWERS.get(challenge_id)
 
 
 def get_challenges_by_category(category: str) -> list[Challenge]:
     """Return challenges filtered by category."""
-    return [c for c in CHALLENGES if c.category == category]
+    return CHALLENGES_BY_CATEGORY.get(category, [])
+
+
+def get_challenge_responses(category: str | None = None) -> list[ChallengeResponse]:
+    """Return the prebuilt public views, optionally filtered by category."""
+    if category is not None:
+        return CHALLENGE_RESPONSES_BY_CATEGORY.get(category, [])
+    return CHALLENGE_RESPONSES
+
+
+def get_challenge_response_by_id(challenge_id: str) -> ChallengeResponse | None:
+    """Return the prebuilt public view of a challenge by ID."""
+    return CHALLENGE_RESPONSES_BY_ID.get(challenge_id)
@@ -1,15 +1,22 @@
-from pydantic_settings import BaseSettings
+from functools import lru_cache
+
+from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
 class Settings(BaseSettings):
+    model_config = SettingsConfigDict(env_file=".env", frozen=True, case_sensitive=False)
+
     database_url: str = "sqlite:///challenge_hub.db"
     default_max_team_size: int = 4
     host: str = "0.0.0.0"
     port: int = 8000
     allowed_origins: list[str] = ["*"]
 
-    class Config:
-        env_file = ".env"
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Return the shared Settings instance without re-reading the environment."""
+    return Settings()
 
 
-settings = Settings()
+settings = get_settings()
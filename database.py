@@ -1,23 +1,66 @@
+import json
 import sqlite3
+import threading
 from contextlib import contextmanager
 from pathlib import Path
 
 DATABASE_PATH = Path("challenge_hub.db")
 
+# Bump whenever init_db's schema statements change so existing databases
+# rerun them (all DDL below is idempotent).
+SCHEMA_VERSION = 6
+
+_local = threading.local()
+
 
 def get_db_path() -> Path:
     return DATABASE_PATH
 
 
+def _connect(path: Path) -> sqlite3.Connection:
+    """Open a connection with performance pragmas applied."""
+    conn = sqlite3.connect(
+        path,
+        check_same_thread=False,
+        isolation_level=None,
+        # All hot-path SQL is module-level constant strings, so a larger
+        # statement cache keeps every query prepared for the connection's
+        # lifetime instead of re-parsing after eviction.
+        cached_statements=1024,
+    )
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    conn.execute("PRAGMA foreign_keys=ON")
+    conn.execute("PRAGMA mmap_size=268435456")
+    return conn
+
+
 @contextmanager
 def get_connection():
-    """Context manager for database connections."""
-    conn = sqlite3.connect(get_db_path())
-    conn.row_factory = sqlite3.Row
+    """Context manager yielding this thread's cached database connection.
+
+    Connections are opened once per thread and reused across requests;
+    they are cheap to reuse but expensive to recreate, so they are not
+    closed on exit.
+    """
+    path = get_db_path()
+    conn = getattr(_local, "conn", None)
+    if conn is None or _local.path != path:
+        if conn is not None:
+            conn.close()
+        conn = _connect(path)
+        _local.conn = conn
+        _local.path = path
     try:
         yield conn
-    finally:
-        conn.close()
+    except BaseException:
+        # Roll back any explicit transaction left open by the failure so the
+        # cached connection is clean for the next request on this thread.
+        if conn.in_transaction:
+            conn.rollback()
+        raise
 
 
 def init_db():
@@ -25,31 +68,55 @@ def init_db():
     with get_connection() as conn:
         cursor = conn.cursor()
 
-        # Teams table
+        # Skip the DDL entirely when the schema is already current.
+        cursor.execute("PRAGMA user_version")
+        if cursor.fetchone()[0] == SCHEMA_VERSION:
+            return
+
+        # Teams table (created_at stored as unix-epoch microseconds, UTC)
         cursor.execute("""
             CREATE TABLE IF NOT EXISTS teams (
                 id TEXT PRIMARY KEY,
                 name TEXT UNIQUE NOT NULL,
-                members TEXT NOT NULL,
                 workspace_id TEXT NOT NULL,
-                created_at TEXT NOT NULL
+                created_at INTEGER NOT NULL
             )
         """)
 
-        # Events table
+        # Team membership (one row per member)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS team_members (
+                team_id TEXT NOT NULL,
+                user_id TEXT NOT NULL,
+                PRIMARY KEY (team_id, user_id),
+                FOREIGN KEY (team_id) REFERENCES teams(id)
+            )
+        """)
+
+        # Events table (start/end stored as unix-epoch seconds, UTC)
         cursor.execute("""
             CREATE TABLE IF NOT EXISTS events (
                 id TEXT PRIMARY KEY,
                 name TEXT NOT NULL,
                 description TEXT NOT NULL,
-                start_time TEXT NOT NULL,
-                end_time TEXT NOT NULL,
-                max_team_size INTEGER NOT NULL,
-                challenge_ids TEXT NOT NULL
+                start_time INTEGER NOT NULL,
+                end_time INTEGER NOT NULL,
+                max_team_size INTEGER NOT NULL
             )
         """)
 
-        # Submissions table
+        # Event -> challenge membership (one row per challenge in an event)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS event_challenges (
+                event_id TEXT NOT NULL,
+                challenge_id TEXT NOT NULL,
+                PRIMARY KEY (event_id, challenge_id),
+                FOREIGN KEY (event_id) REFERENCES events(id)
+            )
+        """)
+
+        # Submissions table (submitted_at stored as unix-epoch microseconds,
+        # UTC, so the leaderboard tiebreaker compares integers)
         cursor.execute("""
             CREATE TABLE IF NOT EXISTS submissions (
                 id TEXT PRIMARY KEY,
@@ -58,7 +125,7 @@ def init_db():
                 challenge_id TEXT NOT NULL,
                 answer TEXT NOT NULL,
                 is_correct INTEGER NOT NULL,
-                submitted_at TEXT NOT NULL,
+                submitted_at INTEGER NOT NULL,
                 FOREIGN KEY (team_id) REFERENCES teams(id),
                 FOREIGN KEY (event_id) REFERENCES events(id)
             )
@@ -80,4 +147,124 @@ def init_db():
             )
         """)
 
+        # Migrate databases that still store members as a JSON column.
+        cursor.execute("PRAGMA table_info(teams)")
+        team_cols = {col["name"]: col["type"] for col in cursor.fetchall()}
+        if "members" in team_cols:
+            cursor.execute("SELECT id, members FROM teams")
+            for row in cursor.fetchall():
+                cursor.executemany(
+                    "INSERT OR IGNORE INTO team_members (team_id, user_id) VALUES (?, ?)",
+                    [(row["id"], member) for member in json.loads(row["members"])],
+                )
+            cursor.execute("ALTER TABLE teams DROP COLUMN members")
+
+        # Migrate databases that still store created_at as ISO text: rebuild
+        # the table with an INTEGER epoch-microseconds column.
+        if team_cols.get("created_at") == "TEXT":
+            cursor.execute("PRAGMA foreign_keys=OFF")
+            cursor.execute("""
+                CREATE TABLE teams_new (
+                    id TEXT PRIMARY KEY,
+                    name TEXT UNIQUE NOT NULL,
+                    workspace_id TEXT NOT NULL,
+                    created_at INTEGER NOT NULL
+                )
+            """)
+            cursor.execute("""
+                INSERT INTO teams_new
+                SELECT id, name, workspace_id,
+                       CAST(strftime('%s', created_at) AS INTEGER) * 1000000
+                FROM teams
+            """)
+            cursor.execute("DROP TABLE teams")
+            cursor.execute("ALTER TABLE teams_new RENAME TO teams")
+            cursor.execute("PRAGMA foreign_keys=ON")
+
+        # Migrate databases that still store challenge ids as a JSON column.
+        cursor.execute("PRAGMA table_info(events)")
+        event_cols = {col["name"]: col["type"] for col in cursor.fetchall()}
+        if "challenge_ids" in event_cols:
+            cursor.execute("SELECT id, challenge_ids FROM events")
+            for row in cursor.fetchall():
+                cursor.executemany(
+                    "INSERT OR IGNORE INTO event_challenges (event_id, challenge_id) VALUES (?, ?)",
+                    [(row["id"], cid) for cid in json.loads(row["challenge_ids"])],
+                )
+            cursor.execute("ALTER TABLE events DROP COLUMN challenge_ids")
+
+        # Migrate databases that still store event times as ISO text: rebuild
+        # the table with INTEGER columns, converting values via strftime('%s').
+        if event_cols.get("start_time") == "TEXT":
+            cursor.execute("PRAGMA foreign_keys=OFF")
+            cursor.execute("""
+                CREATE TABLE events_new (
+                    id TEXT PRIMARY KEY,
+                    name TEXT NOT NULL,
+                    description TEXT NOT NULL,
+                    start_time INTEGER NOT NULL,
+                    end_time INTEGER NOT NULL,
+                    max_team_size INTEGER NOT NULL
+                )
+            """)
+            cursor.execute("""
+                INSERT INTO events_new
+                SELECT id, name, description,
+                       CAST(strftime('%s', start_time) AS INTEGER),
+                       CAST(strftime('%s', end_time) AS INTEGER),
+                       max_team_size
+                FROM events
+            """)
+            cursor.execute("DROP TABLE events")
+            cursor.execute("ALTER TABLE events_new RENAME TO events")
+            cursor.execute("PRAGMA foreign_keys=ON")
+
+        # Migrate databases that still store submitted_at as ISO text: rebuild
+        # the table with an INTEGER epoch-microseconds column. The indexes
+        # dropped with the old table are recreated just below.
+        cursor.execute("PRAGMA table_info(submissions)")
+        submission_cols = {col["name"]: col["type"] for col in cursor.fetchall()}
+        if submission_cols.get("submitted_at") == "TEXT":
+            cursor.execute("PRAGMA foreign_keys=OFF")
+            cursor.execute("""
+                CREATE TABLE submissions_new (
+                    id TEXT PRIMARY KEY,
+                    team_id TEXT NOT NULL,
+                    event_id TEXT NOT NULL,
+                    challenge_id TEXT NOT NULL,
+                    answer TEXT NOT NULL,
+                    is_correct INTEGER NOT NULL,
+                    submitted_at INTEGER NOT NULL,
+                    FOREIGN KEY (team_id) REFERENCES teams(id),
+                    FOREIGN KEY (event_id) REFERENCES events(id)
+                )
+            """)
+            cursor.execute("""
+                INSERT INTO submissions_new
+                SELECT id, team_id, event_id, challenge_id, answer, is_correct,
+                       CAST(strftime('%s', submitted_at) AS INTEGER) * 1000000
+                FROM submissions
+            """)
+            cursor.execute("DROP TABLE submissions")
+            cursor.execute("ALTER TABLE submissions_new RENAME TO submissions")
+            cursor.execute("PRAGMA foreign_keys=ON")
+
+        # Composite index matching the hot /submit lookup. hints_used needs no
+        # extra index: its UNIQUE(team_id, event_id, challenge_id, hint_level)
+        # constraint already indexes the same predicate order.
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_submissions_lookup
+            ON submissions(team_id, event_id, challenge_id, is_correct)
+        """)
+
+        # Event-wide index for the leaderboard aggregation, which filters by
+        # event_id and is_correct across all teams. Per-team scoring queries
+        # are covered by the (team_id, event_id, ...) prefix of the index
+        # above, and hints_used lookups by its UNIQUE constraint's prefix.
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_submissions_event_correct
+            ON submissions(event_id, is_correct)
+        """)
+
+        cursor.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
         conn.commit()
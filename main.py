@@ -1,3 +1,4 @@
+import anyio.to_thread
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
@@ -21,9 +22,13 @@ app.add_middleware(
 
 
 @app.on_event("startup")
-def startup_event():
-    """Initialize database on startup."""
+async def startup_event():
+    """Initialize database and size the worker threadpool on startup."""
     init_db()
+    # Sync route handlers run in anyio's threadpool (default 40 tokens).
+    # SQLite work per request is short, so allow more concurrent handlers
+    # before requests queue behind the pool during a live event.
+    anyio.to_thread.current_default_thread_limiter().total_tokens = 100
 
 
 @app.get("/health")
@@ -0,0 +1,14 @@
+import orjson
+from starlette.responses import JSONResponse
+
+
+class ORJSONResponse(JSONResponse):
+    """JSON response rendered with orjson.
+
+    Used on routes that return plain dicts (response_model=None), where
+    FastAPI's direct Pydantic byte serialization doesn't apply. Replaces
+    fastapi.responses.ORJSONResponse, deprecated since FastAPI 0.128.
+    """
+
+    def render(self, content) -> bytes:
+        return orjson.dumps(content)
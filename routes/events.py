@@ -1,18 +1,20 @@
-import json
 import uuid
+from collections import defaultdict
 from datetime import datetime, timezone
 
 from fastapi import APIRouter, HTTPException
 
 from database import get_connection
 from models import EventCreate, EventUpdate, EventResponse
+from routes.gameplay import invalidate_event_cache
 
 router = APIRouter(prefix="/events", tags=["events"])
 
 
-def get_event_status(start_time: datetime, end_time: datetime) -> str:
-    """Determine event status based on current time."""
-    now = datetime.now(timezone.utc)
+def get_event_status(start_time: datetime, end_time: datetime, now: datetime | None = None) -> str:
+    """Determine event status based on current time (or a caller-supplied one)."""
+    if now is None:
+        now = datetime.now(timezone.utc)
     if now < start_time:
         return "upcoming"
     elif now > end_time:
@@ -20,6 +22,47 @@ def get_event_status(start_time: datetime, end_time: datetime) -> str:
     return "active"
 
 
+def _to_epoch(dt: datetime) -> int:
+    """Convert a datetime to unix-epoch seconds, treating naive values as UTC."""
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return int(dt.timestamp())
+
+
+def _row_to_event(row, challenge_ids: list[str], now: datetime | None = None) -> EventResponse:
+    """Build an EventResponse from a DB row, converting each timestamp once."""
+    start = datetime.fromtimestamp(row["start_time"], tz=timezone.utc)
+    end = datetime.fromtimestamp(row["end_time"], tz=timezone.utc)
+    return EventResponse.model_construct(
+        id=row["id"],
+        name=row["name"],
+        description=row["description"],
+        start_time=start,
+        end_time=end,
+        max_team_size=row["max_team_size"],
+        challenge_ids=challenge_ids,
+        status=get_event_status(start, end, now),
+    )
+
+
+def _get_challenge_ids(cursor, event_id: str) -> list[str]:
+    """Fetch the challenge ids attached to an event."""
+    cursor.execute(
+        "SELECT challenge_id FROM event_challenges WHERE event_id = ?",
+        (event_id,),
+    )
+    return [row["challenge_id"] for row in cursor.fetchall()]
+
+
+def _set_challenge_ids(cursor, event_id: str, challenge_ids: list[str]):
+    """Replace the challenge ids attached to an event."""
+    cursor.execute("DELETE FROM event_challenges WHERE event_id = ?", (event_id,))
+    cursor.executemany(
+        "INSERT OR IGNORE INTO event_challenges (event_id, challenge_id) VALUES (?, ?)",
+        [(event_id, cid) for cid in challenge_ids],
+    )
+
+
 @router.post("", response_model=EventResponse, status_code=201)
 def create_event(event: EventCreate):
     """Create a new event."""
@@ -30,24 +73,25 @@ def create_event(event: EventCreate):
 
     with get_connection() as conn:
         cursor = conn.cursor()
+        cursor.execute("BEGIN IMMEDIATE")
         cursor.execute(
             """
-            INSERT INTO events (id, name, description, start_time, end_time, max_team_size, challenge_ids)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
+            INSERT INTO events (id, name, description, start_time, end_time, max_team_size)
+            VALUES (?, ?, ?, ?, ?, ?)
             """,
             (
                 event_id,
                 event.name,
                 event.description,
-                event.start_time.isoformat(),
-                event.end_time.isoformat(),
+                _to_epoch(event.start_time),
+                _to_epoch(event.end_time),
                 event.max_team_size,
-                json.dumps(event.challenge_ids),
             ),
         )
-        conn.commit()
+        _set_challenge_ids(cursor, event_id, event.challenge_ids)
+        cursor.execute("COMMIT")
 
-    return EventResponse(
+    return EventResponse.model_construct(
         id=event_id,
         name=event.name,
         description=event.description,
@@ -64,25 +108,24 @@ def list_events():
     """List all events."""
     with get_connection() as conn:
         cursor = conn.cursor()
+        # Challenge ids come from a second query rather than GROUP_CONCAT:
+        # they are arbitrary strings, so no join separator is safe to split on.
+        cursor.execute("SELECT event_id, challenge_id FROM event_challenges")
+        ids_by_event: defaultdict[str, list[str]] = defaultdict(list)
+        for row in cursor.fetchall():
+            ids_by_event[row["event_id"]].append(row["challenge_id"])
+
         cursor.execute("SELECT * FROM events ORDER BY start_time DESC")
-        rows = cursor.fetchall()
-
-    return [
-        EventResponse(
-            id=row["id"],
-            name=row["name"],
-            description=row["description"],
-            start_time=datetime.fromisoformat(row["start_time"]),
-            end_time=datetime.fromisoformat(row["end_time"]),
-            max_team_size=row["max_team_size"],
-            challenge_ids=json.loads(row["challenge_ids"]),
-            status=get_event_status(
-                datetime.fromisoformat(row["start_time"]),
-                datetime.fromisoformat(row["end_time"]),
-            ),
-        )
-        for row in rows
-    ]
+        # Iterate the cursor directly so sqlite3 streams rows instead of
+        # buffering the whole result set via fetchall.
+        now = datetime.now(timezone.utc)
+        events = [
+            _row_to_event(row, ids_by_event.get(row["id"], []), now)
+            for row in cursor
+        ]
+        cursor.close()
+
+    return events
 
 
 @router.get("/{event_id}", response_model=EventResponse)
@@ -92,23 +135,11 @@ def get_event(event_id: str):
         cursor = conn.cursor()
         cursor.execute("SELECT * FROM events WHERE id = ?", (event_id,))
         row = cursor.fetchone()
+        if not row:
+            raise HTTPException(status_code=404, detail="Event not found")
+        challenge_ids = _get_challenge_ids(cursor, event_id)
 
-    if not row:
-        raise HTTPException(status_code=404, detail="Event not found")
-
-    return EventResponse(
-        id=row["id"],
-        name=row["name"],
-        description=row["description"],
-        start_time=datetime.fromisoformat(row["start_time"]),
-        end_time=datetime.fromisoformat(row["end_time"]),
-        max_team_size=row["max_team_size"],
-        challenge_ids=json.loads(row["challenge_ids"]),
-        status=get_event_status(
-            datetime.fromisoformat(row["start_time"]),
-            datetime.fromisoformat(row["end_time"]),
-        ),
-    )
+    return _row_to_event(row, challenge_ids)
 
 
 @router.put("/{event_id}", response_model=EventResponse)
@@ -124,32 +155,42 @@ def update_event(event_id: str, update: EventUpdate):
 
         new_name = update.name if update.name is not None else row["name"]
         new_description = update.description if update.description is not None else row["description"]
-        new_start_time = update.start_time.isoformat() if update.start_time else row["start_time"]
-        new_end_time = update.end_time.isoformat() if update.end_time else row["end_time"]
+        new_start_time = _to_epoch(update.start_time) if update.start_time else row["start_time"]
+        new_end_time = _to_epoch(update.end_time) if update.end_time else row["end_time"]
         new_max_team_size = update.max_team_size if update.max_team_size is not None else row["max_team_size"]
-        new_challenge_ids = json.dumps(update.challenge_ids) if update.challenge_ids is not None else row["challenge_ids"]
 
+        cursor.execute("BEGIN IMMEDIATE")
         cursor.execute(
             """
             UPDATE events
-            SET name = ?, description = ?, start_time = ?, end_time = ?, max_team_size = ?, challenge_ids = ?
+            SET name = ?, description = ?, start_time = ?, end_time = ?, max_team_size = ?
             WHERE id = ?
             """,
-            (new_name, new_description, new_start_time, new_end_time, new_max_team_size, new_challenge_ids, event_id),
+            (new_name, new_description, new_start_time, new_end_time, new_max_team_size, event_id),
+        )
+        if update.challenge_ids is not None:
+            _set_challenge_ids(cursor, event_id, update.challenge_ids)
+        cursor.execute("COMMIT")
+
+        new_challenge_ids = (
+            update.challenge_ids
+            if update.challenge_ids is not None
+            else _get_challenge_ids(cursor, event_id)
         )
-        conn.commit()
 
-    start = datetime.fromisoformat(new_start_time)
-    end = datetime.fromisoformat(new_end_time)
+    invalidate_event_cache(event_id)
 
-    return EventResponse(
+    start = datetime.fromtimestamp(new_start_time, tz=timezone.utc)
+    end = datetime.fromtimestamp(new_end_time, tz=timezone.utc)
+
+    return EventResponse.model_construct(
         id=event_id,
         name=new_name,
         description=new_description,
         start_time=start,
         end_time=end,
         max_team_size=new_max_team_size,
-        challenge_ids=json.loads(new_challenge_ids) if isinstance(new_challenge_ids, str) else new_challenge_ids,
+        challenge_ids=new_challenge_ids,
         status=get_event_status(start, end),
     )
 
@@ -163,5 +204,13 @@ def delete_event(event_id: str):
         if not cursor.fetchone():
             raise HTTPException(status_code=404, detail="Event not found")
 
+        cursor.execute("BEGIN IMMEDIATE")
+        # Dependent rows first: submissions and hints_used reference events(id)
+        # and foreign keys are enforced.
+        cursor.execute("DELETE FROM submissions WHERE event_id = ?", (event_id,))
+        cursor.execute("DELETE FROM hints_used WHERE event_id = ?", (event_id,))
+        cursor.execute("DELETE FROM event_challenges WHERE event_id = ?", (event_id,))
         cursor.execute("DELETE FROM events WHERE id = ?", (event_id,))
-        conn.commit()
+        cursor.execute("COMMIT")
+
+    invalidate_event_cache(event_id)
@@ -1,31 +1,34 @@
-import json
+import time
 import uuid
 from datetime import datetime, timezone
 
 from fastapi import APIRouter, HTTPException, Query
 
+from responses import ORJSONResponse
+
 from database import get_connection
-from challenges import get_challenge_by_id
+from challenges import get_challenge_by_id, get_hint_by_level
 from models import (
     SubmitAnswer,
     SubmitResponse,
     HintResponse,
-    LeaderboardResponse,
     TeamProgress,
 )
 from services.validation import validate_answer
 from services.scoring import calculate_team_score, get_completed_challenges, get_hints_used
-from services.leaderboard import get_leaderboard
+from services.leaderboard import get_leaderboard, invalidate_leaderboard
 
 router = APIRouter(prefix="/events/{event_id}", tags=["gameplay"])
 
 
-def get_event_or_404(event_id: str):
+def get_event_or_404(event_id: str, conn=None):
     """Get event or raise 404."""
-    with get_connection() as conn:
-        cursor = conn.cursor()
-        cursor.execute("SELECT * FROM events WHERE id = ?", (event_id,))
-        row = cursor.fetchone()
+    if conn is None:
+        with get_connection() as conn:
+            return get_event_or_404(event_id, conn)
+    cursor = conn.cursor()
+    cursor.execute("SELECT * FROM events WHERE id = ?", (event_id,))
+    row = cursor.fetchone()
     if not row:
         raise HTTPException(status_code=404, detail="Event not found")
     return row
@@ -33,34 +36,49 @@ def get_event_or_404(event_id: str):
 
 def check_event_active(event_row):
     """Check if event is active, raise 400 if not."""
-    start = datetime.fromisoformat(event_row["start_time"])
-    end = datetime.fromisoformat(event_row["end_time"])
-    now = datetime.now(timezone.utc)
-
-    # Make start/end timezone-aware if they aren't
-    if start.tzinfo is None:
-        start = start.replace(tzinfo=timezone.utc)
-    if end.tzinfo is None:
-        end = end.replace(tzinfo=timezone.utc)
-
-    if now < start:
+    # start/end are stored as unix-epoch seconds, so this is two int compares.
+    now = int(time.time())
+    if now < event_row["start_time"]:
         raise HTTPException(status_code=400, detail="Event not active: has not started")
-    if now > end:
+    if now > event_row["end_time"]:
         raise HTTPException(status_code=400, detail="Event not active: has ended")
 
 
-def check_team_exists(team_id: str):
+def check_team_exists(team_id: str, conn=None):
     """Check if team exists, raise 404 if not."""
-    with get_connection() as conn:
-        cursor = conn.cursor()
-        cursor.execute("SELECT id FROM teams WHERE id = ?", (team_id,))
-        if not cursor.fetchone():
-            raise HTTPException(status_code=404, detail="Team not found")
+    if conn is None:
+        with get_connection() as conn:
+            return check_team_exists(team_id, conn)
+    cursor = conn.cursor()
+    cursor.execute("SELECT id FROM teams WHERE id = ?", (team_id,))
+    if not cursor.fetchone():
+        raise HTTPException(status_code=404, detail="Team not found")
 
 
-def check_challenge_in_event(event_row, challenge_id: str):
+# Parsed challenge-id sets per event, so steady-state membership checks skip
+# json.loads. Invalidated by the events routes on update/delete.
+_event_challenge_sets: dict[str, frozenset[str]] = {}
+
+
+def invalidate_event_cache(event_id: str):
+    """Drop the cached challenge-id set for an event after update/delete."""
+    _event_challenge_sets.pop(event_id, None)
+
+
+def check_challenge_in_event(event_id: str, challenge_id: str, conn=None):
     """Check if challenge is part of event, raise 404 if not."""
-    challenge_ids = json.loads(event_row["challenge_ids"])
+    challenge_ids = _event_challenge_sets.get(event_id)
+    if challenge_ids is None:
+        if conn is None:
+            with get_connection() as conn:
+                return check_challenge_in_event(event_id, challenge_id, conn)
+        cursor = conn.cursor()
+        cursor.execute(
+            "SELECT challenge_id FROM event_challenges WHERE event_id = ?",
+            (event_id,),
+        )
+        challenge_ids = frozenset(row["challenge_id"] for row in cursor.fetchall())
+        _event_challenge_sets[event_id] = challenge_ids
     if challenge_id not in challenge_ids:
         raise HTTPException(status_code=404, detail="Challenge not in this event")
 
@@ -68,35 +86,47 @@ def check_challenge_in_event(event_row, challenge_id: str):
 @router.post("/submit", response_model=SubmitResponse)
 def submit_answer(event_id: str, submission: SubmitAnswer):
     """Submit an answer for a challenge."""
-    event_row = get_event_or_404(event_id)
-    check_event_active(event_row)
-    check_team_exists(submission.team_id)
-    check_challenge_in_event(event_row, submission.challenge_id)
-
-    # Check if already solved
     with get_connection() as conn:
+        # One round trip for the event row, team existence, and duplicate-solve
+        # check instead of three separate SELECTs.
         cursor = conn.cursor()
         cursor.execute(
             """
-            SELECT id FROM submissions
-            WHERE team_id = ? AND event_id = ? AND challenge_id = ? AND is_correct = 1
+            SELECT e.*,
+                   (SELECT 1 FROM teams WHERE id = ?) AS team_ok,
+                   (SELECT 1 FROM submissions
+                    WHERE team_id = ? AND event_id = ? AND challenge_id = ? AND is_correct = 1
+                   ) AS already_solved
+            FROM events e WHERE e.id = ?
             """,
-            (submission.team_id, event_id, submission.challenge_id),
+            (
+                submission.team_id,
+                submission.team_id,
+                event_id,
+                submission.challenge_id,
+                event_id,
+            ),
         )
-        if cursor.fetchone():
+        event_row = cursor.fetchone()
+        if not event_row:
+            raise HTTPException(status_code=404, detail="Event not found")
+        check_event_active(event_row)
+        if not event_row["team_ok"]:
+            raise HTTPException(status_code=404, detail="Team not found")
+        check_challenge_in_event(event_id, submission.challenge_id, conn)
+        if event_row["already_solved"]:
             raise HTTPException(status_code=400, detail="Challenge already completed")
 
-    # Validate answer
-    is_correct, challenge = validate_answer(submission.challenge_id, submission.answer)
-    if challenge is None:
-        raise HTTPException(status_code=404, detail="Challenge not found")
+        # Validate answer
+        is_correct, challenge = validate_answer(submission.challenge_id, submission.answer)
+        if challenge is None:
+            raise HTTPException(status_code=404, detail="Challenge not found")
 
-    # Record submission
-    submission_id = str(uuid.uuid4())
-    submitted_at = datetime.now(timezone.utc)
+        # Record submission
+        submission_id = uuid.uuid4().hex
+        submitted_at = datetime.now(timezone.utc)
 
-    with get_connection() as conn:
-        cursor = conn.cursor()
+        cursor.execute("BEGIN IMMEDIATE")
         cursor.execute(
             """
             INSERT INTO submissions (id, team_id, event_id, challenge_id, answer, is_correct, submitted_at)
@@ -109,10 +139,13 @@ def submit_answer(event_id: str, submission: SubmitAnswer):
                 submission.challenge_id,
                 submission.answer,
                 1 if is_correct else 0,
-                submitted_at.isoformat(),
+                int(submitted_at.timestamp() * 1_000_000),
             ),
         )
-        conn.commit()
+        cursor.execute("COMMIT")
+
+    if is_correct:
+        invalidate_leaderboard(event_id)
 
     points_earned = challenge.points if is_correct else 0
     current_score = calculate_team_score(submission.team_id, event_id)
@@ -133,27 +166,21 @@ def get_hint(
     level: int = Query(..., ge=1, description="Hint level (1, 2, 3...)"),
 ):
     """Reveal a hint for a challenge."""
-    event_row = get_event_or_404(event_id)
-    check_event_active(event_row)
-    check_team_exists(team_id)
-    check_challenge_in_event(event_row, challenge_id)
-
-    challenge = get_challenge_by_id(challenge_id)
-    if not challenge:
-        raise HTTPException(status_code=404, detail="Challenge not found")
-
-    # Find the hint
-    hint = None
-    for h in challenge.hints:
-        if h.order == level:
-            hint = h
-            break
-
-    if not hint:
-        raise HTTPException(status_code=404, detail=f"Hint level {level} not available")
-
-    # Check if already revealed
     with get_connection() as conn:
+        event_row = get_event_or_404(event_id, conn)
+        check_event_active(event_row)
+        check_team_exists(team_id, conn)
+        check_challenge_in_event(event_id, challenge_id, conn)
+
+        challenge = get_challenge_by_id(challenge_id)
+        if not challenge:
+            raise HTTPException(status_code=404, detail="Challenge not found")
+
+        hint = get_hint_by_level(challenge_id, level)
+        if not hint:
+            raise HTTPException(status_code=404, detail=f"Hint level {level} not available")
+
+        # Check if already revealed
         cursor = conn.cursor()
         cursor.execute(
             """
@@ -166,8 +193,9 @@ def get_hint(
 
         if not existing:
             # Record hint usage
-            hint_id = str(uuid.uuid4())
+            hint_id = uuid.uuid4().hex
             revealed_at = datetime.now(timezone.utc)
+            cursor.execute("BEGIN IMMEDIATE")
             cursor.execute(
                 """
                 INSERT INTO hints_used (id, team_id, event_id, challenge_id, hint_level, revealed_at, cost)
@@ -175,7 +203,8 @@ def get_hint(
                 """,
                 (hint_id, team_id, event_id, challenge_id, level, revealed_at.isoformat(), hint.cost),
             )
-            conn.commit()
+            cursor.execute("COMMIT")
+            invalidate_leaderboard(event_id)
 
     return HintResponse(
         challenge_id=challenge_id,
@@ -185,7 +214,9 @@ def get_hint(
     )
 
 
-@router.get("/leaderboard", response_model=LeaderboardResponse)
+# orjson renders the raw leaderboard dicts; routes with a response_model
+# already get FastAPI's direct Pydantic byte serialization instead.
+@router.get("/leaderboard", response_model=None, response_class=ORJSONResponse)
 def leaderboard(event_id: str):
     """Get the leaderboard for an event."""
     get_event_or_404(event_id)  # Verify event exists
@@ -195,8 +226,9 @@ def leaderboard(event_id: str):
 @router.get("/teams/{team_id}/progress", response_model=TeamProgress)
 def team_progress(event_id: str, team_id: str):
     """Get a team's progress in an event."""
-    get_event_or_404(event_id)
-    check_team_exists(team_id)
+    with get_connection() as conn:
+        get_event_or_404(event_id, conn)
+        check_team_exists(team_id, conn)
 
     return TeamProgress(
         team_id=team_id,
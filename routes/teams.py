@@ -1,9 +1,11 @@
-import json
 import uuid
+from collections import defaultdict
 from datetime import datetime, timezone
 
 from fastapi import APIRouter, HTTPException
 
+from responses import ORJSONResponse
+
 from config import settings
 from database import get_connection
 from models import TeamCreate, TeamUpdate, TeamResponse
@@ -11,37 +13,69 @@ from models import TeamCreate, TeamUpdate, TeamResponse
 router = APIRouter(prefix="/teams", tags=["teams"])
 
 
+def _from_epoch_us(value: int) -> datetime:
+    """Convert stored epoch microseconds back to an aware datetime."""
+    return datetime.fromtimestamp(value / 1_000_000, tz=timezone.utc)
+
+
+def _row_to_team(row, members: list[str]) -> TeamResponse:
+    """Build a TeamResponse from a teams row and its member list."""
+    return TeamResponse.model_construct(
+        id=row["id"],
+        name=row["name"],
+        members=members,
+        workspace_id=row["workspace_id"],
+        created_at=_from_epoch_us(row["created_at"]),
+    )
+
+
+def _get_members(cursor, team_id: str) -> list[str]:
+    """Fetch a team's member ids."""
+    cursor.execute("SELECT user_id FROM team_members WHERE team_id = ?", (team_id,))
+    return [row["user_id"] for row in cursor.fetchall()]
+
+
+def _set_members(cursor, team_id: str, members: list[str]):
+    """Replace a team's membership rows."""
+    cursor.execute("DELETE FROM team_members WHERE team_id = ?", (team_id,))
+    cursor.executemany(
+        "INSERT OR IGNORE INTO team_members (team_id, user_id) VALUES (?, ?)",
+        [(team_id, member) for member in members],
+    )
+
+
 @router.post("", response_model=TeamResponse, status_code=201)
 def create_team(team: TeamCreate):
     """Create a new team."""
+    # Check team size
+    if len(team.members) > settings.default_max_team_size:
+        raise HTTPException(
+            status_code=422,
+            detail=f"Team exceeds max size of {settings.default_max_team_size}",
+        )
+
     team_id = str(uuid.uuid4())
     created_at = datetime.now(timezone.utc)
 
     with get_connection() as conn:
         cursor = conn.cursor()
-
-        # Check for duplicate name
-        cursor.execute("SELECT id FROM teams WHERE name = ?", (team.name,))
-        if cursor.fetchone():
-            raise HTTPException(status_code=409, detail="Team name already exists")
-
-        # Check team size
-        if len(team.members) > settings.default_max_team_size:
-            raise HTTPException(
-                status_code=422,
-                detail=f"Team exceeds max size of {settings.default_max_team_size}",
-            )
-
+        cursor.execute("BEGIN IMMEDIATE")
         cursor.execute(
             """
-            INSERT INTO teams (id, name, members, workspace_id, created_at)
-            VALUES (?, ?, ?, ?, ?)
+            INSERT INTO teams (id, name, workspace_id, created_at)
+            VALUES (?, ?, ?, ?)
+            ON CONFLICT(name) DO NOTHING
+            RETURNING id
             """,
-            (team_id, team.name, json.dumps(team.members), team.workspace_id, created_at.isoformat()),
+            (team_id, team.name, team.workspace_id, int(created_at.timestamp() * 1_000_000)),
         )
-        conn.commit()
+        if cursor.fetchone() is None:
+            cursor.execute("ROLLBACK")
+            raise HTTPException(status_code=409, detail="Team name already exists")
+        _set_members(cursor, team_id, team.members)
+        cursor.execute("COMMIT")
 
-    return TeamResponse(
+    return TeamResponse.model_construct(
         id=team_id,
         name=team.name,
         members=team.members,
@@ -50,24 +84,36 @@ def create_team(team: TeamCreate):
     )
 
 
-@router.get("", response_model=list[TeamResponse])
+@router.get("", response_model=None, response_class=ORJSONResponse)
 def list_teams():
     """List all teams."""
     with get_connection() as conn:
         cursor = conn.cursor()
-        cursor.execute("SELECT * FROM teams ORDER BY created_at DESC")
-        rows = cursor.fetchall()
-
-    return [
-        TeamResponse(
-            id=row["id"],
-            name=row["name"],
-            members=json.loads(row["members"]),
-            workspace_id=row["workspace_id"],
-            created_at=datetime.fromisoformat(row["created_at"]),
+        # Members come from a second query rather than GROUP_CONCAT: user ids
+        # are arbitrary strings, so no join separator is safe to split on.
+        cursor.execute("SELECT team_id, user_id FROM team_members")
+        members_by_team: defaultdict[str, list[str]] = defaultdict(list)
+        for row in cursor.fetchall():
+            members_by_team[row["team_id"]].append(row["user_id"])
+
+        cursor.execute(
+            "SELECT id, name, workspace_id, created_at FROM teams ORDER BY created_at DESC"
         )
-        for row in rows
-    ]
+        # Plain dicts rendered by ORJSONResponse: skips per-entry model
+        # construction on the hot listing path.
+        teams = [
+            {
+                "id": row["id"],
+                "name": row["name"],
+                "members": members_by_team.get(row["id"], []),
+                "workspace_id": row["workspace_id"],
+                "created_at": _from_epoch_us(row["created_at"]),
+            }
+            for row in cursor
+        ]
+        cursor.close()
+
+    return teams
 
 
 @router.get("/{team_id}", response_model=TeamResponse)
@@ -75,53 +121,52 @@ def get_team(team_id: str):
     """Get a team by ID."""
     with get_connection() as conn:
         cursor = conn.cursor()
-        cursor.execute("SELECT * FROM teams WHERE id = ?", (team_id,))
+        cursor.execute(
+            "SELECT id, name, workspace_id, created_at FROM teams WHERE id = ?",
+            (team_id,),
+        )
         row = cursor.fetchone()
+        if not row:
+            raise HTTPException(status_code=404, detail="Team not found")
+        members = _get_members(cursor, team_id)
 
-    if not row:
-        raise HTTPException(status_code=404, detail="Team not found")
-
-    return TeamResponse(
-        id=row["id"],
-        name=row["name"],
-        members=json.loads(row["members"]),
-        workspace_id=row["workspace_id"],
-        created_at=datetime.fromisoformat(row["created_at"]),
-    )
+    return _row_to_team(row, members)
 
 
 @router.put("/{team_id}", response_model=TeamResponse)
 def update_team(team_id: str, update: TeamUpdate):
     """Update a team."""
+    # Check team size
+    if update.members is not None and len(update.members) > settings.default_max_team_size:
+        raise HTTPException(
+            status_code=422,
+            detail=f"Team exceeds max size of {settings.default_max_team_size}",
+        )
+
     with get_connection() as conn:
         cursor = conn.cursor()
-        cursor.execute("SELECT * FROM teams WHERE id = ?", (team_id,))
+        cursor.execute(
+            "SELECT id, name, workspace_id, created_at FROM teams WHERE id = ?",
+            (team_id,),
+        )
         row = cursor.fetchone()
-
         if not row:
             raise HTTPException(status_code=404, detail="Team not found")
 
-        # Check team size
-        if update.members is not None and len(update.members) > settings.default_max_team_size:
-            raise HTTPException(
-                status_code=422,
-                detail=f"Team exceeds max size of {settings.default_max_team_size}",
-            )
-
-        new_members = update.members if update.members is not None else json.loads(row["members"])
+        if update.members is not None:
+            cursor.execute("BEGIN IMMEDIATE")
+            _set_members(cursor, team_id, update.members)
+            cursor.execute("COMMIT")
+            members = update.members
+        else:
+            members = _get_members(cursor, team_id)
 
-        cursor.execute(
-            "UPDATE teams SET members = ? WHERE id = ?",
-            (json.dumps(new_members), team_id),
-        )
-        conn.commit()
-
-    return TeamResponse(
+    return TeamResponse.model_construct(
         id=row["id"],
         name=row["name"],
-        members=new_members,
+        members=members,
         workspace_id=row["workspace_id"],
-        created_at=datetime.fromisoformat(row["created_at"]),
+        created_at=_from_epoch_us(row["created_at"]),
     )
 
 
@@ -130,9 +175,15 @@ def delete_team(team_id: str):
     """Delete a team."""
     with get_connection() as conn:
         cursor = conn.cursor()
-        cursor.execute("SELECT id FROM teams WHERE id = ?", (team_id,))
-        if not cursor.fetchone():
-            raise HTTPException(status_code=404, detail="Team not found")
-
-        cursor.execute("DELETE FROM teams WHERE id = ?", (team_id,))
-        conn.commit()
+        cursor.execute("BEGIN IMMEDIATE")
+        # Dependent rows first: submissions and hints_used reference teams(id)
+        # and foreign keys are enforced.
+        cursor.execute("DELETE FROM submissions WHERE team_id = ?", (team_id,))
+        cursor.execute("DELETE FROM hints_used WHERE team_id = ?", (team_id,))
+        cursor.execute("DELETE FROM team_members WHERE team_id = ?", (team_id,))
+        cursor.execute("DELETE FROM teams WHERE id = ? RETURNING id", (team_id,))
+        deleted = cursor.fetchone()
+        cursor.execute("COMMIT" if deleted else "ROLLBACK")
+
+    if not deleted:
+        raise HTTPException(status_code=404, detail="Team not found")
@@ -1,61 +1,90 @@
-import json
+import time
 from datetime import datetime, timezone
 
+from challenges import get_all_challenges
 from database import get_connection
-from models import LeaderboardEntry, LeaderboardResponse
-from services.scoring import calculate_team_score, get_completed_challenges
 
+# Static challenge-points rows inlined into the leaderboard query as a VALUES
+# CTE, so scoring happens entirely inside SQLite in one statement.
+_POINTS_ROWS = [(c.id, c.points) for c in get_all_challenges()]
+
+_LEADERBOARD_SQL = f"""
+    WITH challenge_points(id, points) AS (
+        VALUES {", ".join(["(?, ?)"] * len(_POINTS_ROWS))}
+    ),
+    scores AS (
+        SELECT t.id AS team_id,
+               t.name AS team_name,
+               COALESCE(SUM(cp.points), 0) - COALESCE(h.cost, 0) AS score,
+               COUNT(DISTINCT s.challenge_id) AS challenges_completed,
+               MAX(s.submitted_at) AS last_submission
+        FROM teams t
+        JOIN submissions s
+          ON s.team_id = t.id AND s.event_id = ? AND s.is_correct = 1
+        LEFT JOIN challenge_points cp ON cp.id = s.challenge_id
+        LEFT JOIN (
+            SELECT team_id, SUM(cost) AS cost
+            FROM hints_used
+            WHERE event_id = ?
+            GROUP BY team_id
+        ) h ON h.team_id = t.id
+        GROUP BY t.id, t.name
+    )
+    SELECT *, ROW_NUMBER() OVER (ORDER BY score DESC, last_submission ASC) AS rank
+    FROM scores
+    ORDER BY rank
+"""
+
+_POINTS_PARAMS = [value for row in _POINTS_ROWS for value in row]
+
+# Short-TTL response cache so leaderboard polling bursts during an event
+# collapse into one computation. Writes that change scores invalidate it.
+_CACHE_TTL_SECONDS = 2.0
+_cache: dict[str, tuple[float, dict]] = {}
+
+
+def invalidate_leaderboard(event_id: str):
+    """Drop the cached leaderboard after a score-changing write."""
+    _cache.pop(event_id, None)
+
+
+def get_leaderboard(event_id: str) -> dict:
+    """Generate leaderboard for an event (shaped like LeaderboardResponse)."""
+    cached = _cache.get(event_id)
+    if cached and time.monotonic() - cached[0] < _CACHE_TTL_SECONDS:
+        return cached[1]
 
-def get_leaderboard(event_id: str) -> LeaderboardResponse:
-    """Generate leaderboard for an event."""
     with get_connection() as conn:
         cursor = conn.cursor()
+        cursor.execute(_LEADERBOARD_SQL, (*_POINTS_PARAMS, event_id, event_id))
+        rows = cursor.fetchall()
 
-        # Get all teams that have submissions for this event
-        cursor.execute(
-            """
-            SELECT DISTINCT t.id, t.name, MAX(s.submitted_at) as last_submission
-            FROM teams t
-            JOIN submissions s ON t.id = s.team_id
-            WHERE s.event_id = ? AND s.is_correct = 1
-            GROUP BY t.id, t.name
-            """,
-            (event_id,),
-        )
-        teams_with_submissions = cursor.fetchall()
-
-    # Calculate scores for each team
-    team_scores = []
-    for row in teams_with_submissions:
-        team_id = row["id"]
-        score = calculate_team_score(team_id, event_id)
-        completed = get_completed_challenges(team_id, event_id)
-        team_scores.append({
-            "team_id": team_id,
-            "team_name": row["name"],
-            "score": score,
-            "challenges_completed": len(completed),
-            "last_submission": row["last_submission"],
-        })
-
-    # Sort by score (descending), then by last_submission (ascending) for tiebreaker
-    team_scores.sort(key=lambda x: (-x["score"], x["last_submission"]))
-
-    # Build rankings
-    rankings = []
-    for i, ts in enumerate(team_scores):
-        rankings.append(
-            LeaderboardEntry(
-                rank=i + 1,
-                team_id=ts["team_id"],
-                team_name=ts["team_name"],
-                score=ts["score"],
-                challenges_completed=ts["challenges_completed"],
-            )
-        )
-
-    return LeaderboardResponse(
-        event_id=event_id,
-        rankings=rankings,
-        generated_at=datetime.now(timezone.utc),
-    )
+    if not rows:
+        empty = {
+            "event_id": event_id,
+            "rankings": [],
+            "generated_at": datetime.now(timezone.utc),
+        }
+        _cache[event_id] = (time.monotonic(), empty)
+        return empty
+
+    # Plain dicts rendered by the route's ORJSONResponse: skips per-entry
+    # model construction, and the shape stays cacheable across requests.
+    rankings = [
+        {
+            "rank": row["rank"],
+            "team_id": row["team_id"],
+            "team_name": row["team_name"],
+            "score": row["score"],
+            "challenges_completed": row["challenges_completed"],
+        }
+        for row in rows
+    ]
+
+    response = {
+        "event_id": event_id,
+        "rankings": rankings,
+        "generated_at": datetime.now(timezone.utc),
+    }
+    _cache[event_id] = (time.monotonic(), response)
+    return response
@@ -1,6 +1,34 @@
-import json
+from collections import defaultdict
+from functools import lru_cache
+
 from database import get_connection
-from challenges import get_challenge_by_id
+from challenges import get_all_challenges
+
+
+@lru_cache(maxsize=1)
+def _points_by_id() -> dict[str, int]:
+    """Cache the static {challenge_id: points} mapping for score sums."""
+    return {c.id: c.points for c in get_all_challenges()}
+
+
+@lru_cache(maxsize=1)
+def _score_query() -> tuple[str, tuple]:
+    """Build the single-statement score query and its challenge-point params."""
+    points_by_id = _points_by_id()
+    sql = f"""
+        WITH challenge_points(id, points) AS (
+            VALUES {", ".join(["(?, ?)"] * len(points_by_id))}
+        )
+        SELECT (SELECT COALESCE(SUM(cp.points), 0)
+                FROM submissions s
+                JOIN challenge_points cp ON cp.id = s.challenge_id
+                WHERE s.team_id = ? AND s.event_id = ? AND s.is_correct = 1)
+             - (SELECT COALESCE(SUM(cost), 0)
+                FROM hints_used
+                WHERE team_id = ? AND event_id = ?) AS score
+    """
+    params = tuple(value for item in points_by_id.items() for value in item)
+    return sql, params
 
 
 def calculate_team_score(team_id: str, event_id: str) -> int:
@@ -9,37 +37,11 @@ def calculate_team_score(team_id: str, event_id: str) -> int:
 
     Score = sum(points for correct submissions) - sum(hint costs)
     """
+    sql, point_params = _score_query()
     with get_connection() as conn:
         cursor = conn.cursor()
-
-        # Get points from correct submissions
-        cursor.execute(
-            """
-            SELECT challenge_id FROM submissions
-            WHERE team_id = ? AND event_id = ? AND is_correct = 1
-            """,
-            (team_id, event_id),
-        )
-        correct_submissions = cursor.fetchall()
-
-        points = 0
-        for row in correct_submissions:
-            challenge = get_challenge_by_id(row["challenge_id"])
-            if challenge:
-                points += challenge.points
-
-        # Subtract hint costs
-        cursor.execute(
-            """
-            SELECT SUM(cost) as total_cost FROM hints_used
-            WHERE team_id = ? AND event_id = ?
-            """,
-            (team_id, event_id),
-        )
-        hint_row = cursor.fetchone()
-        hint_costs = hint_row["total_cost"] or 0
-
-    return points - hint_costs
+        cursor.execute(sql, (*point_params, team_id, event_id, team_id, event_id))
+        return cursor.fetchone()["score"]
 
 
 def get_completed_challenges(team_id: str, event_id: str) -> list[str]:
@@ -72,11 +74,8 @@ def get_hints_used(team_id: str, event_id: str) -> dict[str, list[int]]:
         )
         rows = cursor.fetchall()
 
-    hints: dict[str, list[int]] = {}
+    hints: defaultdict[str, list[int]] = defaultdict(list)
     for row in rows:
-        cid = row["challenge_id"]
-        if cid not in hints:
-            hints[cid] = []
-        hints[cid].append(row["hint_level"])
+        hints[row["challenge_id"]].append(row["hint_level"])
 
-    return hints
+    return dict(hints)
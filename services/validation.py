@@ -1,6 +1,4 @@
-import re
-
-from challenges import get_challenge_by_id
+from challenges import get_casefolded_answer, get_challenge_by_id, get_compiled_pattern
 from models import Challenge
 
 
@@ -16,15 +14,12 @@ def validate_answer(challenge_id: str, submitted_answer: str) -> tuple[bool, Cha
         return False, None
 
     submitted = submitted_answer.strip()
-    expected = challenge.expected_answer
 
     if challenge.validation_type == "exact":
-        is_correct = submitted.lower() == expected.lower()
+        is_correct = submitted.casefold() == get_casefolded_answer(challenge_id)
     elif challenge.validation_type == "regex":
-        try:
-            is_correct = bool(re.fullmatch(expected, submitted, re.IGNORECASE))
-        except re.error:
-            is_correct = False
+        pattern = get_compiled_pattern(challenge_id)
+        is_correct = bool(pattern.fullmatch(submitted)) if pattern else False
     else:
         is_correct = False
 